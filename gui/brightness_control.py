@@ -2,28 +2,30 @@
 Brightness control module for power saving mode
 """
 import os
-import subprocess
 
 class BrightnessControl:
-    def __init__(self):
+    def __init__(self, sysfs_root='/sys'):
+        self.sysfs_root = sysfs_root
         self.original_brightness = None
+        self.max_brightness = None
+        self.brightness_fd = None
         self.brightness_interface = self._find_brightness_interface()
     
     def _find_brightness_interface(self):
         """Find the brightness control interface"""
+        backlight_dir = os.path.join(self.sysfs_root, 'class', 'backlight')
         paths = [
-            '/sys/class/backlight/intel_backlight',
-            '/sys/class/backlight/acpi_video0',
-            '/sys/class/backlight/amdgpu_bl0',
-            '/sys/class/backlight/nvidia_0',
-            '/sys/class/backlight/radeon_bl0',
+            os.path.join(backlight_dir, 'intel_backlight'),
+            os.path.join(backlight_dir, 'acpi_video0'),
+            os.path.join(backlight_dir, 'amdgpu_bl0'),
+            os.path.join(backlight_dir, 'nvidia_0'),
+            os.path.join(backlight_dir, 'radeon_bl0'),
         ]
         
         for path in paths:
             if os.path.exists(path):
                 return path
         
-        backlight_dir = '/sys/class/backlight'
         if os.path.exists(backlight_dir):
             devices = os.listdir(backlight_dir)
             if devices:
@@ -31,15 +33,24 @@ class BrightnessControl:
         
         return None
     
+    def _get_brightness_fd(self):
+        """Open the brightness attribute once and keep the descriptor cached"""
+        if self.brightness_fd is None:
+            brightness_file = os.path.join(self.brightness_interface, 'brightness')
+            try:
+                self.brightness_fd = os.open(brightness_file, os.O_RDWR | os.O_CLOEXEC)
+            except PermissionError:
+                self.brightness_fd = os.open(brightness_file, os.O_RDONLY | os.O_CLOEXEC)
+        return self.brightness_fd
+    
     def get_current_brightness(self):
         """Get current brightness level"""
         if not self.brightness_interface:
             return None
         
         try:
-            brightness_file = os.path.join(self.brightness_interface, 'brightness')
-            with open(brightness_file, 'r') as f:
-                return int(f.read().strip())
+            data = os.pread(self._get_brightness_fd(), 32, 0)
+            return int(data.split(b'\n')[0].strip())
         except:
             return None
     
@@ -48,12 +59,14 @@ class BrightnessControl:
         if not self.brightness_interface:
             return None
         
-        try:
-            max_file = os.path.join(self.brightness_interface, 'max_brightness')
-            with open(max_file, 'r') as f:
-                return int(f.read().strip())
-        except:
-            return None
+        if self.max_brightness is None:
+            try:
+                max_file = os.path.join(self.brightness_interface, 'max_brightness')
+                with open(max_file, 'r') as f:
+                    self.max_brightness = int(f.read().strip())
+            except:
+                return None
+        return self.max_brightness
     
     def set_brightness(self, value):
         """Set brightness to specific value"""
@@ -61,13 +74,17 @@ class BrightnessControl:
             return False
         
         try:
-            brightness_file = os.path.join(self.brightness_interface, 'brightness')
-            subprocess.run(['sh', '-c', f'echo {value} > {brightness_file}'], 
-                         check=True, stderr=subprocess.DEVNULL)
-            return True
+            data = f'{int(value)}\n'.encode()
+            return os.pwrite(self._get_brightness_fd(), data, 0) == len(data)
         except:
             return False
     
+    def close(self):
+        """Close the cached brightness descriptor"""
+        if self.brightness_fd is not None:
+            os.close(self.brightness_fd)
+            self.brightness_fd = None
+    
     def set_brightness_percent(self, percent):
         """Set brightness as percentage (0-100)"""
         max_brightness = self.get_max_brightness()
@@ -5,9 +5,12 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import scheduler_module
 import time
 import os
+import re
 import sys
 from brightness_control import BrightnessControl
 
+SYSFS_ROOT = os.environ.get("SCHEDULER_SYSFS_ROOT", "/sys")
+
 class Dashboard:
     def __init__(self, root):
         self.root = root
@@ -22,10 +25,10 @@ class Dashboard:
             )
             sys.exit(1)
         
-        self.scheduler = scheduler_module.Scheduler()
+        self.scheduler = scheduler_module.Scheduler(SYSFS_ROOT)
         self.scheduler.start_monitoring()
 
-        self.brightness_control = BrightnessControl()
+        self.brightness_control = BrightnessControl(SYSFS_ROOT)
         
         self.running = True
         self.all_processes = []
@@ -110,7 +113,7 @@ class Dashboard:
         
         self.process_tree = ttk.Treeview(
             tree_frame,
-            columns=("PID", "Name", "Priority", "Status", "Memory", "CPU"),
+            columns=("PID", "Name", "Priority", "Status", "Memory", "CPU", "Policy", "I/O"),
             show="headings",
             selectmode="extended"
             )
@@ -121,6 +124,8 @@ class Dashboard:
         self.process_tree.heading("Status", text="Status", command=lambda: self.sort_treeview("Status"))
         self.process_tree.heading("Memory", text="Memory (MB)", command=lambda: self.sort_treeview("Memory"))
         self.process_tree.heading("CPU", text="CPU (%)", command=lambda: self.sort_treeview("CPU"))
+        self.process_tree.heading("Policy", text="Policy", command=lambda: self.sort_treeview("Policy"))
+        self.process_tree.heading("I/O", text="I/O", command=lambda: self.sort_treeview("I/O"))
         
         self.process_tree.column("PID", width=80, anchor=tk.CENTER)
         self.process_tree.column("Name", width=200, anchor=tk.W)
@@ -128,6 +133,8 @@ class Dashboard:
         self.process_tree.column("Status", width=100, anchor=tk.CENTER)
         self.process_tree.column("Memory", width=120, anchor=tk.E)
         self.process_tree.column("CPU", width=100, anchor=tk.E)
+        self.process_tree.column("Policy", width=100, anchor=tk.CENTER)
+        self.process_tree.column("I/O", width=80, anchor=tk.CENTER)
         
         vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.process_tree.yview)
         hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.process_tree.xview)
@@ -157,6 +164,12 @@ class Dashboard:
         self.swap_label = ttk.Label(self.status_frame, text="Swap: 0.00%", font=("Arial", 12))
         self.swap_label.grid(row=0, column=2, padx=10)
         
+        self.power_label = ttk.Label(self.status_frame, text="Power: N/A", font=("Arial", 12))
+        self.power_label.grid(row=0, column=3, padx=10)
+        
+        self.mode_power_label = ttk.Label(self.status_frame, text="", font=("Arial", 10))
+        self.mode_power_label.grid(row=1, column=0, columnspan=4, sticky=tk.W, padx=10, pady=(5, 0))
+        
         self.fig, self.ax = plt.subplots(figsize=(10, 6))
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.performance_frame)
         self.canvas.get_tk_widget().grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -195,10 +208,23 @@ class Dashboard:
         self.algorithm_combo.set("Hybrid")
         self.algorithm_combo.grid(row=3, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
+        ttk.Label(self.settings_frame, text="Interactive CPUs:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        self.reserved_cpus_entry = ttk.Entry(self.settings_frame, width=20)
+        self.reserved_cpus_text = self.format_cpulist(self.scheduler.get_reserved_cpus())
+        self.reserved_cpus_entry.insert(0, self.reserved_cpus_text)
+        self.reserved_cpus_entry.grid(row=4, column=1, sticky=tk.W, padx=(10, 0), pady=5)
+        
+        self.realtime_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.settings_frame,
+            text="Real-time interactive processes (SCHED_RR)",
+            variable=self.realtime_var
+        ).grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=5)
+        
         descriptions = ttk.LabelFrame(self.settings_frame, text="Algorithm Descriptions", padding="10")
-        descriptions.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(20, 10))
+        descriptions.grid(row=6, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(20, 10))
         
-        desc_text = tk.Text(descriptions, height=10, width=60, wrap=tk.WORD, state='disabled')
+        desc_text = tk.Text(descriptions, height=14, width=60, wrap=tk.WORD, state='disabled')
         desc_text.pack(fill=tk.BOTH, expand=True)
         
         desc_text.config(state='normal')
@@ -206,11 +232,15 @@ class Dashboard:
             "FCFS (First-Come-First-Served): Earlier processes get higher priority\n\n"
             "SJF (Shortest Job First): Processes with less CPU time get priority\n\n"
             "Priority: Uses process priority values directly\n\n"
-            "Round-Robin: All processes get equal time slices\n\n"
+            "Round-Robin: All processes get equal priority and the configured time slice\n\n"
             "Hybrid (Recommended): Adapts based on process behavior:\n"
-            "  • Interactive (foreground) → Highest priority\n"
-            "  • I/O bound (low CPU) → Medium-high priority\n"
-            "  • CPU bound (high CPU) → Lower priority"
+            "  • Interactive (foreground) → Highest priority, boosted utilization\n"
+            "  • I/O bound (low CPU) → Medium-high priority, high I/O priority\n"
+            "  • CPU bound (high CPU) → Lower priority, SCHED_BATCH\n"
+            "  • Background → SCHED_IDLE, idle I/O class\n\n"
+            "Hybrid and Gaming mode also reserve the Interactive CPUs for foreground\n"
+            "processes and keep CPU-bound and background work on the remaining cores\n"
+            "(leave empty for automatic selection)"
         )
         desc_text.config(state='disabled')
         
@@ -219,7 +249,17 @@ class Dashboard:
             text="Apply Settings", 
             command=self.apply_settings,
             width=20
-        ).grid(row=5, column=0, columnspan=2, pady=(20, 0))
+        ).grid(row=7, column=0, columnspan=2, pady=(20, 0))
+    
+    def format_cpulist(self, cpus):
+        """Format a list of CPU ids as a cpulist string such as '0-3,8'"""
+        ranges = []
+        for cpu in cpus:
+            if ranges and cpu == ranges[-1][1] + 1:
+                ranges[-1][1] = cpu
+            else:
+                ranges.append([cpu, cpu])
+        return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
     
     def setup_logs_tab(self):
         """Setup the logs tab"""
@@ -276,11 +316,31 @@ class Dashboard:
             self.update_label_color(self.mem_label, mem, 85, 70)
             self.update_label_color(self.swap_label, swap, 70, 50)
             
+            self.update_power()
+            
             self.update_graph(cpu, mem, swap)
             
         except Exception as e:
             self.log_message(f"Error in update_ui: {str(e)}")
     
+    def update_power(self):
+        """Update package power readings from RAPL"""
+        mode_power = self.scheduler.get_mode_power()
+        if not mode_power:
+            return
+        
+        self.power_label.config(text=f"Power: {self.scheduler.get_power_watts():.2f} W")
+        
+        mode_names = {
+            scheduler_module.Mode.GAMING: "Gaming",
+            scheduler_module.Mode.PRODUCTIVITY: "Productivity",
+            scheduler_module.Mode.POWER_SAVING: "Power-Saving"
+        }
+        averages = ", ".join(
+            f"{mode_names[mode]}: {watts:.2f} W" for mode, watts in mode_power.items()
+        )
+        self.mode_power_label.config(text=f"Average power by mode - {averages}")
+    
     def update_label_color(self, label, value, critical, warning):
         """Update label color based on value thresholds"""
         if value > critical:
@@ -347,7 +407,9 @@ class Dashboard:
                     proc.priority,
                     "Suspended" if proc.is_suspended else "Running",
                     f"{proc.memory_usage / (1024 * 1024):.2f}",
-                    f"{proc.cpu_usage:.2f}"
+                    f"{proc.cpu_usage:.2f}",
+                    self.format_policy(proc),
+                    self.format_io_priority(proc)
                 ))
             
                 if selected_pid and proc.pid == selected_pid:
@@ -381,6 +443,30 @@ class Dashboard:
                 self.process_tree.move(item, '', index)  
 
 
+    def format_policy(self, proc):
+        """Format scheduling policy and utilization clamps of a process"""
+        policy_names = {
+            scheduler_module.SCHED_OTHER: "OTHER",
+            scheduler_module.SCHED_FIFO: "FIFO",
+            scheduler_module.SCHED_RR: "RR",
+            scheduler_module.SCHED_BATCH: "BATCH",
+            scheduler_module.SCHED_IDLE: "IDLE"
+        }
+        name = policy_names.get(proc.sched_policy, str(proc.sched_policy))
+        if proc.util_min > 0 or proc.util_max < 1024:
+            name += f" {proc.util_min}-{proc.util_max}"
+        return name
+    
+    def format_io_priority(self, proc):
+        """Format I/O priority class and level of a process"""
+        if proc.io_class == scheduler_module.IO_CLASS_BEST_EFFORT:
+            return f"be/{proc.io_level}"
+        elif proc.io_class == scheduler_module.IO_CLASS_REALTIME:
+            return f"rt/{proc.io_level}"
+        elif proc.io_class == scheduler_module.IO_CLASS_IDLE:
+            return "idle"
+        return "none"
+    
     def sort_treeview(self, col):
         """Sort treeview by column"""
         if self.sort_column == col:
@@ -451,7 +537,8 @@ class Dashboard:
         if selected_mode == "Gaming":
             self.log_message(f"Mode changed to {selected_mode} - Foreground apps prioritized, background suspended")
         elif selected_mode == "Power-Saving":
-            self.log_message(f"Mode changed to {selected_mode} - All processes minimized, heavy processes suspended")
+            self.log_message(f"Mode changed to {selected_mode} - All processes minimized, heavy processes suspended, "
+                             f"CPU frequency capped")
         else:
             self.log_message(f"Mode changed to {selected_mode} - Balanced resource allocation")
     
@@ -469,6 +556,12 @@ class Dashboard:
             if mem_threshold < 50 or mem_threshold > 10000:
                 raise ValueError("Memory threshold must be between 50 and 10000 MB")
             
+            reserved = self.reserved_cpus_entry.get().strip()
+            if reserved and not re.fullmatch(r"\d{1,4}(-\d{1,4})?(,\d{1,4}(-\d{1,4})?)*", reserved):
+                raise ValueError("Interactive CPUs must be a CPU list such as 0-3,8")
+            
+            if reserved != self.reserved_cpus_text:
+                self.scheduler.set_reserved_cpus(reserved)
             self.scheduler.set_custom_params(time_slice, mem_threshold)
             
             alg_map = {
@@ -482,8 +575,16 @@ class Dashboard:
             selected_alg = self.algorithm_combo.get()
             self.scheduler.set_algorithm(alg_map[selected_alg])
             
+            self.scheduler.set_realtime_interactive(self.realtime_var.get())
+            reserved = self.format_cpulist(self.scheduler.get_reserved_cpus())
+            self.reserved_cpus_text = reserved
+            self.reserved_cpus_entry.delete(0, tk.END)
+            self.reserved_cpus_entry.insert(0, reserved)
+            
             self.log_message(f"Settings applied: Time slice={time_slice}ms, "
-                           f"Memory threshold={mem_threshold}MB, Algorithm={selected_alg}")
+                           f"Memory threshold={mem_threshold}MB, Algorithm={selected_alg}, "
+                           f"Interactive CPUs={reserved or 'none'}, "
+                           f"Real-time interactive={'on' if self.realtime_var.get() else 'off'}")
             messagebox.showinfo("Settings", "Settings applied successfully!")
             
         except ValueError as e:
@@ -598,8 +699,12 @@ class Dashboard:
             if hasattr(self, '_brightness_saved') and self._brightness_saved:
                 self.brightness_control.restore_brightness()
                 self.log_message("Display brightness restored")
+            self.brightness_control.close()
         
             self.scheduler.stop_monitoring()
+            self.scheduler.restore_power_settings()
+            self.scheduler.restore_affinity()
+            self.scheduler.restore_policies()
             self.root.destroy()
 
 
@@ -0,0 +1,55 @@
+#ifndef AFFINITY_PLANNER_H
+#define AFFINITY_PLANNER_H
+
+#include "process_manager.h"
+#include <vector>
+#include <map>
+#include <string>
+#include <sys/types.h>
+
+struct NumaNode {
+    int id;
+    std::vector<int> cpus;
+};
+
+// Keeps CPU-bound and background processes off a set of cores reserved for
+// the interactive class, using the topology read from sysfs at construction.
+// Reserved CPUs always cover whole physical cores (all SMT siblings) so
+// interactive work never shares a core with confined processes. Only the
+// confined classes are ever moved, and never outside their original mask;
+// original per-thread masks are saved on first use and restored when a
+// process leaves those classes or on reset(). Not thread-safe: the owning
+// Scheduler serializes access.
+class AffinityPlanner {
+public:
+    explicit AffinityPlanner(const std::string& sysfs_root = "/sys");
+
+    void set_reserved_cpus(const std::string& cpulist);
+    std::vector<int> get_reserved_cpus() const;
+    std::vector<int> get_online_cpus() const;
+
+    std::vector<int> plan_cpus(ProcessClass cls, int preferred_node) const;
+    void rebalance(const std::map<pid_t, ProcessClass>& membership);
+    void reset();
+
+    bool is_enabled() const;
+
+private:
+    std::string sysfs_root;
+    std::vector<int> online_cpus;
+    std::vector<std::vector<int>> cores;
+    std::vector<NumaNode> nodes;
+    std::vector<int> reserved_cpus;
+    std::vector<int> shared_cpus;
+    std::map<pid_t, ProcessClass> applied;
+    std::map<pid_t, std::map<pid_t, std::vector<int>>> original_masks;
+
+    void discover_topology();
+    void reserve_default_cores();
+    void update_shared_cpus();
+    int get_memory_node(pid_t pid) const;
+    void apply_affinity(pid_t pid, const std::vector<int>& cpus);
+    void restore_affinity(pid_t pid);
+};
+
+#endif
@@ -14,6 +14,8 @@ public:
         double cpu_usage
     );
     
+    static void log_power(const std::string& mode, double watts);
+    
     static void set_log_file(const std::string& filename);
     static void enable_logging(bool enabled);
     
@@ -0,0 +1,40 @@
+#ifndef POLICY_MANAGER_H
+#define POLICY_MANAGER_H
+
+#include "process_manager.h"
+#include <map>
+#include <sys/types.h>
+
+// Maps scheduling classes to sched_setattr policies, utilization clamps
+// and I/O priorities. Policies are only re-applied to a process when its
+// desired policy changes. Each thread's original scheduling attributes and
+// I/O priority are saved on first use and restored by reset(); real-time
+// and deadline threads we did not promote ourselves are never touched.
+// Not thread-safe: the owning Scheduler serializes access.
+class PolicyManager {
+public:
+    PolicyManager();
+    ~PolicyManager();
+
+    void set_time_slice(int time_slice_ms);
+    void set_realtime_interactive(bool enabled);
+
+    SchedPolicy plan_policy(ProcessClass cls, double cpu_usage) const;
+    SchedPolicy round_robin_policy() const;
+
+    void rebalance(const std::map<pid_t, SchedPolicy>& desired);
+    void reset();
+
+private:
+    int time_slice_ms;
+    bool realtime_interactive;
+    int saved_rr_timeslice_ms;
+    std::map<pid_t, SchedPolicy> applied;
+    std::map<pid_t, std::map<pid_t, TaskSchedState>> original_states;
+
+    void apply_policy(pid_t pid, const SchedPolicy& policy);
+    void restore_policy(pid_t pid);
+    void set_rr_timeslice(bool enabled);
+};
+
+#endif
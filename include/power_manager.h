@@ -0,0 +1,72 @@
+#ifndef POWER_MANAGER_H
+#define POWER_MANAGER_H
+
+#include "scheduler.h"
+#include <vector>
+#include <map>
+#include <string>
+#include <chrono>
+
+struct CpuFreqPolicy {
+    std::string path;
+    std::string governor;
+    std::string energy_perf_pref;
+    long max_freq;
+    long cpuinfo_min_freq;
+    long cpuinfo_max_freq;
+    std::vector<std::string> available_governors;
+};
+
+struct RaplDomain {
+    std::string path;
+    unsigned long long max_energy_uj;
+    unsigned long long last_energy_uj;
+};
+
+struct ModeEnergy {
+    double energy_joules;
+    double seconds;
+};
+
+// Drives cpufreq and reads RAPL energy counters directly through sysfs.
+// Energy counters are opened once and polled with pread; cpufreq attributes
+// are read at discovery and only opened again when a mode writes them.
+// Not thread-safe: the owning Scheduler serializes access.
+class PowerManager {
+public:
+    explicit PowerManager(const std::string& sysfs_root = "/sys");
+    ~PowerManager();
+
+    void apply_mode(Mode mode);
+    void restore();
+
+    double sample_power();
+    double get_current_power() const;
+    std::map<Mode, double> get_mode_power() const;
+
+    bool has_cpufreq() const;
+    bool has_rapl() const;
+
+private:
+    std::string sysfs_root;
+    std::vector<CpuFreqPolicy> policies;
+    std::vector<RaplDomain> rapl_domains;
+    std::map<std::string, int> fds;
+
+    Mode current_mode;
+    bool modified;
+    double current_power;
+    std::chrono::steady_clock::time_point last_sample_time;
+    std::map<Mode, ModeEnergy> mode_energy;
+
+    void discover_cpufreq();
+    void discover_rapl();
+
+    int get_fd(const std::string& path);
+    bool read_attr(const std::string& path, std::string& value);
+    bool write_attr(const std::string& path, const std::string& value);
+
+    void set_governor(const CpuFreqPolicy& policy, const std::string& governor);
+};
+
+#endif
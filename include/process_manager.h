@@ -5,6 +5,44 @@
 #include <string>
 #include <sys/types.h>
 
+enum class ProcessClass {
+    INTERACTIVE,
+    IO_BOUND,
+    CPU_BOUND,
+    BACKGROUND
+};
+
+// CPU usage (%) above which a process counts as CPU-bound
+const double CPU_BOUND_THRESHOLD = 70.0;
+
+enum IoPriorityClass {
+    IO_CLASS_NONE = 0,
+    IO_CLASS_REALTIME = 1,
+    IO_CLASS_BEST_EFFORT = 2,
+    IO_CLASS_IDLE = 3
+};
+
+struct SchedPolicy {
+    int policy;
+    int rt_priority;
+    int util_min;
+    int util_max;
+    long slice_us;
+    int io_class;
+    int io_level;
+};
+
+struct TaskSchedState {
+    int policy;
+    int nice;
+    int rt_priority;
+    unsigned long long runtime_ns;
+    int util_min;
+    int util_max;
+    int io_class;
+    int io_level;
+};
+
 struct ProcessInfo {
     pid_t pid;
     std::string name;
@@ -15,12 +53,27 @@ struct ProcessInfo {
     long memory_usage;
     double cpu_usage;
     long last_cpu_time;
+    int sched_policy;
+    int util_min;
+    int util_max;
+    int io_class;
+    int io_level;
 };
 
 class ProcessManager {
 public:
     static std::vector<ProcessInfo> get_running_processes();
     static void set_priority(pid_t pid, int priority);
+    static bool process_exists(pid_t pid);
+    static std::vector<pid_t> get_threads(pid_t pid);
+    static std::vector<int> get_thread_affinity(pid_t tid);
+    static void set_thread_affinity(pid_t tid, const std::vector<int>& cpus);
+    static void set_affinity(pid_t pid, const std::vector<int>& cpus);
+    static bool is_realtime_policy(int policy);
+    static bool get_task_sched_state(pid_t tid, TaskSchedState& state);
+    static void restore_task_sched_state(pid_t tid, const TaskSchedState& state);
+    static void set_task_sched_policy(pid_t tid, const SchedPolicy& policy, int nice);
+    static void set_task_io_priority(pid_t tid, int io_class, int io_level);
     static void suspend_process(pid_t pid);
     static void resume_process(pid_t pid);
     static void terminate_process(pid_t pid);
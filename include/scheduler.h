@@ -3,6 +3,9 @@
 
 #include "process_manager.h"
 #include <vector>
+#include <map>
+#include <memory>
+#include <string>
 #include <thread>
 #include <shared_mutex>
 #include <mutex>
@@ -23,9 +26,13 @@ enum class SchedulingAlgorithm {
     HYBRID
 };
 
+class PowerManager;
+class AffinityPlanner;
+class PolicyManager;
+
 class Scheduler {
 public:
-    Scheduler();
+    explicit Scheduler(const std::string& sysfs_root = "/sys");
     ~Scheduler();
     
     void set_mode(Mode mode);
@@ -38,10 +45,24 @@ public:
     std::vector<ProcessInfo> get_processes() const;
     void adjust_priorities();
     
+    double get_power_watts() const;
+    std::map<Mode, double> get_mode_power() const;
+    void restore_power_settings();
+    
+    void set_reserved_cpus(const std::string& cpulist);
+    std::vector<int> get_reserved_cpus() const;
+    void restore_affinity();
+    
+    void set_realtime_interactive(bool enabled);
+    void restore_policies();
+    
 private:
     Mode current_mode;
     SchedulingAlgorithm current_algorithm;
     std::vector<ProcessInfo> processes;
+    std::unique_ptr<PowerManager> power_manager;
+    std::unique_ptr<AffinityPlanner> affinity_planner;
+    std::unique_ptr<PolicyManager> policy_manager;
     
     std::thread monitoring_thread;
     std::atomic<bool> running;
@@ -56,6 +77,10 @@ private:
     void monitor_processes();
     void apply_mode_settings();
     void perform_scheduling();
+    void apply_affinity();
+    void apply_policies();
+    
+    static ProcessClass classify_process(const ProcessInfo& proc);
     
     void fcfs_schedule();
     void sjf_schedule();
@@ -50,6 +50,32 @@ void Logger::log_performance(
     log_file.flush();
 }
 
+void Logger::log_power(const std::string& mode, double watts) {
+    if (!logging_enabled) return;
+    
+    auto now = std::chrono::system_clock::now();
+    auto now_c = std::chrono::system_clock::to_time_t(now);
+    std::tm* now_tm = std::localtime(&now_c);
+    
+    std::stringstream ss;
+    ss << std::put_time(now_tm, "%Y-%m-%d %H:%M:%S");
+    std::string timestamp = ss.str();
+    
+    if (!log_file.is_open()) {
+        log_file.open(log_filename, std::ios::app);
+        if (!log_file.is_open()) {
+            std::cerr << "Failed to open log file: " << log_filename << std::endl;
+            return;
+        }
+    }
+    
+    log_file << "[" << timestamp << "] "
+             << "Power - Mode: " << mode << ", "
+             << "Package: " << std::fixed << std::setprecision(2) << watts << " W" << std::endl;
+    
+    log_file.flush();
+}
+
 void Logger::set_log_file(const std::string& filename) {
     if (log_file.is_open()) {
         log_file.close();
@@ -0,0 +1,292 @@
+#include "power_manager.h"
+#include <dirent.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <climits>
+#include <cstdlib>
+#include <cctype>
+#include <algorithm>
+#include <sstream>
+#include <fstream>
+
+namespace {
+
+const int POWER_SAVING_FREQ_PERCENT = 60;
+
+std::string trim(const std::string& s) {
+    size_t start = s.find_first_not_of(" \t\n");
+    if (start == std::string::npos) return "";
+    size_t end = s.find_last_not_of(" \t\n");
+    return s.substr(start, end - start + 1);
+}
+
+// For attributes that are only read during discovery, so they do not pin a
+// descriptor for the lifetime of the manager.
+bool read_once(const std::string& path, std::string& value) {
+    std::ifstream file(path);
+    if (!file.is_open()) return false;
+    std::getline(file, value);
+    value = trim(value);
+    return true;
+}
+
+bool is_cpu_entry(const char* name) {
+    if (std::string(name).compare(0, 3, "cpu") != 0 || !name[3]) return false;
+    for (const char* p = name + 3; *p; ++p) {
+        if (!std::isdigit(static_cast<unsigned char>(*p))) return false;
+    }
+    return true;
+}
+
+// Top-level RAPL zones are named "intel-rapl:N"; subdomains such as
+// "intel-rapl:0:0" are already included in their package's counter.
+bool is_rapl_zone(const std::string& name) {
+    const std::string prefix = "intel-rapl:";
+    if (name.compare(0, prefix.size(), prefix) != 0) return false;
+    return name.find(':', prefix.size()) == std::string::npos;
+}
+
+// Only "package-N" zones are summed: the platform ("psys") zone already
+// includes package power and would double-count it.
+bool is_package_domain(const std::string& zone_path) {
+    std::string name;
+    return read_once(zone_path + "/name", name) && name.compare(0, 8, "package-") == 0;
+}
+
+}
+
+PowerManager::PowerManager(const std::string& sysfs_root)
+    : sysfs_root(sysfs_root),
+      current_mode(Mode::PRODUCTIVITY),
+      modified(false),
+      current_power(0.0) {
+    discover_cpufreq();
+    discover_rapl();
+}
+
+PowerManager::~PowerManager() {
+    restore();
+    for (const auto& pair : fds) {
+        if (pair.second >= 0) close(pair.second);
+    }
+}
+
+void PowerManager::discover_cpufreq() {
+    std::string cpu_dir = sysfs_root + "/devices/system/cpu";
+    DIR* dir = opendir(cpu_dir.c_str());
+    if (!dir) return;
+
+    std::vector<std::string> seen;
+    struct dirent* entry;
+    while ((entry = readdir(dir))) {
+        if (!is_cpu_entry(entry->d_name)) continue;
+
+        std::string path = cpu_dir + "/" + entry->d_name + "/cpufreq";
+        char resolved[PATH_MAX];
+        std::string key = realpath(path.c_str(), resolved) ? resolved : path;
+        if (std::find(seen.begin(), seen.end(), key) != seen.end()) continue;
+
+        CpuFreqPolicy policy;
+        policy.path = path;
+        if (!read_once(path + "/scaling_governor", policy.governor)) continue;
+        seen.push_back(key);
+
+        read_once(path + "/energy_performance_preference", policy.energy_perf_pref);
+
+        std::string value;
+        policy.max_freq = read_once(path + "/scaling_max_freq", value) ? std::atol(value.c_str()) : 0;
+        policy.cpuinfo_min_freq = read_once(path + "/cpuinfo_min_freq", value) ? std::atol(value.c_str()) : 0;
+        policy.cpuinfo_max_freq = read_once(path + "/cpuinfo_max_freq", value) ? std::atol(value.c_str()) : 0;
+
+        if (read_once(path + "/scaling_available_governors", value)) {
+            std::istringstream iss(value);
+            std::string governor;
+            while (iss >> governor) policy.available_governors.push_back(governor);
+        }
+
+        policies.push_back(policy);
+    }
+    closedir(dir);
+}
+
+void PowerManager::discover_rapl() {
+    std::string powercap_dir = sysfs_root + "/class/powercap";
+    DIR* dir = opendir(powercap_dir.c_str());
+    if (!dir) return;
+
+    struct dirent* entry;
+    while ((entry = readdir(dir))) {
+        if (!is_rapl_zone(entry->d_name)) continue;
+
+        RaplDomain domain;
+        domain.path = powercap_dir + "/" + entry->d_name;
+        if (!is_package_domain(domain.path)) continue;
+
+        std::string value;
+        if (!read_attr(domain.path + "/energy_uj", value)) continue;
+        domain.last_energy_uj = std::strtoull(value.c_str(), nullptr, 10);
+        domain.max_energy_uj = read_once(domain.path + "/max_energy_range_uj", value)
+            ? std::strtoull(value.c_str(), nullptr, 10) : 0;
+
+        rapl_domains.push_back(domain);
+    }
+    closedir(dir);
+
+    last_sample_time = std::chrono::steady_clock::now();
+}
+
+int PowerManager::get_fd(const std::string& path) {
+    auto it = fds.find(path);
+    if (it != fds.end()) return it->second;
+
+    int fd = open(path.c_str(), O_RDONLY | O_CLOEXEC);
+    fds[path] = fd;
+    return fd;
+}
+
+bool PowerManager::read_attr(const std::string& path, std::string& value) {
+    int fd = get_fd(path);
+    if (fd < 0) return false;
+
+    char buf[512];
+    ssize_t n = pread(fd, buf, sizeof(buf) - 1, 0);
+    if (n < 0) return false;
+    buf[n] = '\0';
+    std::string content(buf);
+    value = trim(content.substr(0, content.find('\n')));
+    return true;
+}
+
+// cpufreq attributes are only written on mode changes, so they are opened
+// per write instead of holding several descriptors per policy.
+bool PowerManager::write_attr(const std::string& path, const std::string& value) {
+    int fd = open(path.c_str(), O_WRONLY | O_CLOEXEC);
+    if (fd < 0) return false;
+
+    std::string data = value + "\n";
+    bool ok = pwrite(fd, data.c_str(), data.size(), 0) == static_cast<ssize_t>(data.size());
+    close(fd);
+    return ok;
+}
+
+void PowerManager::set_governor(const CpuFreqPolicy& policy, const std::string& governor) {
+    if (!policy.available_governors.empty() &&
+        std::find(policy.available_governors.begin(), policy.available_governors.end(),
+                  governor) == policy.available_governors.end()) {
+        return;
+    }
+    write_attr(policy.path + "/scaling_governor", governor);
+}
+
+void PowerManager::apply_mode(Mode mode) {
+    current_mode = mode;
+
+    switch (mode) {
+        case Mode::GAMING:
+            for (const auto& policy : policies) {
+                if (!policy.energy_perf_pref.empty()) {
+                    write_attr(policy.path + "/energy_performance_preference", "performance");
+                }
+                set_governor(policy, "performance");
+                if (policy.cpuinfo_max_freq > 0) {
+                    write_attr(policy.path + "/scaling_max_freq",
+                               std::to_string(policy.cpuinfo_max_freq));
+                }
+            }
+            modified = true;
+            break;
+
+        case Mode::PRODUCTIVITY:
+            restore();
+            break;
+
+        case Mode::POWER_SAVING:
+            for (const auto& policy : policies) {
+                set_governor(policy, "powersave");
+                if (!policy.energy_perf_pref.empty()) {
+                    write_attr(policy.path + "/energy_performance_preference", "power");
+                }
+                if (policy.cpuinfo_max_freq > policy.cpuinfo_min_freq) {
+                    long cap = policy.cpuinfo_min_freq +
+                        (policy.cpuinfo_max_freq - policy.cpuinfo_min_freq) *
+                        POWER_SAVING_FREQ_PERCENT / 100;
+                    write_attr(policy.path + "/scaling_max_freq", std::to_string(cap));
+                }
+            }
+            modified = true;
+            break;
+    }
+}
+
+void PowerManager::restore() {
+    if (!modified) return;
+
+    for (const auto& policy : policies) {
+        write_attr(policy.path + "/scaling_governor", policy.governor);
+        if (!policy.energy_perf_pref.empty()) {
+            write_attr(policy.path + "/energy_performance_preference", policy.energy_perf_pref);
+        }
+        if (policy.max_freq > 0) {
+            write_attr(policy.path + "/scaling_max_freq", std::to_string(policy.max_freq));
+        }
+    }
+    modified = false;
+}
+
+double PowerManager::sample_power() {
+    if (rapl_domains.empty()) return 0.0;
+
+    auto now = std::chrono::steady_clock::now();
+    double elapsed = std::chrono::duration<double>(now - last_sample_time).count();
+    if (elapsed < 0.1) return current_power;
+
+    double delta_joules = 0.0;
+    bool valid = true;
+    for (auto& domain : rapl_domains) {
+        std::string value;
+        if (!read_attr(domain.path + "/energy_uj", value)) continue;
+
+        unsigned long long energy = std::strtoull(value.c_str(), nullptr, 10);
+        if (energy < domain.last_energy_uj && domain.max_energy_uj == 0) {
+            // Counter wrapped but its range is unknown: the delta can't be trusted
+            valid = false;
+        } else {
+            unsigned long long delta = energy >= domain.last_energy_uj
+                ? energy - domain.last_energy_uj
+                : domain.max_energy_uj - domain.last_energy_uj + energy;
+            delta_joules += delta / 1e6;
+        }
+        domain.last_energy_uj = energy;
+    }
+
+    last_sample_time = now;
+    if (!valid) return current_power;
+
+    current_power = delta_joules / elapsed;
+    mode_energy[current_mode].energy_joules += delta_joules;
+    mode_energy[current_mode].seconds += elapsed;
+
+    return current_power;
+}
+
+double PowerManager::get_current_power() const {
+    return current_power;
+}
+
+std::map<Mode, double> PowerManager::get_mode_power() const {
+    std::map<Mode, double> result;
+    for (const auto& pair : mode_energy) {
+        if (pair.second.seconds > 0) {
+            result[pair.first] = pair.second.energy_joules / pair.second.seconds;
+        }
+    }
+    return result;
+}
+
+bool PowerManager::has_cpufreq() const {
+    return !policies.empty();
+}
+
+bool PowerManager::has_rapl() const {
+    return !rapl_domains.empty();
+}
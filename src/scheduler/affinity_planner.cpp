@@ -0,0 +1,329 @@
+#include "affinity_planner.h"
+#include <dirent.h>
+#include <fstream>
+#include <sstream>
+#include <algorithm>
+#include <iterator>
+#include <cctype>
+#include <cstdlib>
+#include <exception>
+#include <stdexcept>
+
+namespace {
+
+// Highest CPU id the kernel can be configured with (NR_CPUS <= 8192)
+const int MAX_CPU_ID = 8191;
+
+// Expands a cpulist such as "0-3,8", ignoring ids above max_cpu so a
+// malformed or hostile range cannot blow up the result.
+std::vector<int> parse_cpulist(const std::string& cpulist, int max_cpu) {
+    std::vector<int> cpus;
+    std::stringstream ss(cpulist);
+    std::string range;
+    while (std::getline(ss, range, ',')) {
+        size_t start = range.find_first_not_of(" \t\n");
+        if (start == std::string::npos) continue;
+        range = range.substr(start);
+
+        size_t dash = range.find('-');
+        long first = std::atol(range.c_str());
+        long last = dash == std::string::npos ? first : std::atol(range.c_str() + dash + 1);
+        first = std::max(0L, first);
+        last = std::min<long>(max_cpu, last);
+        for (long cpu = first; cpu <= last; ++cpu) cpus.push_back(static_cast<int>(cpu));
+    }
+    std::sort(cpus.begin(), cpus.end());
+    cpus.erase(std::unique(cpus.begin(), cpus.end()), cpus.end());
+    return cpus;
+}
+
+bool read_line(const std::string& path, std::string& value) {
+    std::ifstream file(path);
+    if (!file.is_open()) return false;
+    std::getline(file, value);
+    return true;
+}
+
+bool contains(const std::vector<int>& cpus, int cpu) {
+    return std::binary_search(cpus.begin(), cpus.end(), cpu);
+}
+
+std::vector<int> intersect(const std::vector<int>& a, const std::vector<int>& b) {
+    std::vector<int> result;
+    std::set_intersection(a.begin(), a.end(), b.begin(), b.end(), std::back_inserter(result));
+    return result;
+}
+
+bool is_confined(ProcessClass cls) {
+    return cls == ProcessClass::CPU_BOUND || cls == ProcessClass::BACKGROUND;
+}
+
+// Lists numeric suffixes of directory entries such as "cpu12" or "node1".
+std::vector<int> list_indexed_entries(const std::string& path, const std::string& prefix) {
+    std::vector<int> ids;
+    DIR* dir = opendir(path.c_str());
+    if (!dir) return ids;
+
+    struct dirent* entry;
+    while ((entry = readdir(dir))) {
+        std::string name = entry->d_name;
+        if (name.compare(0, prefix.size(), prefix) != 0 || name.size() == prefix.size()) continue;
+        if (!std::all_of(name.begin() + prefix.size(), name.end(),
+                         [](char c) { return std::isdigit(static_cast<unsigned char>(c)); })) {
+            continue;
+        }
+        ids.push_back(std::atoi(name.c_str() + prefix.size()));
+    }
+    closedir(dir);
+    std::sort(ids.begin(), ids.end());
+    return ids;
+}
+
+}
+
+AffinityPlanner::AffinityPlanner(const std::string& sysfs_root)
+    : sysfs_root(sysfs_root) {
+    discover_topology();
+    reserve_default_cores();
+    update_shared_cpus();
+}
+
+void AffinityPlanner::discover_topology() {
+    std::string cpu_dir = sysfs_root + "/devices/system/cpu";
+    std::string value;
+    if (read_line(cpu_dir + "/online", value)) {
+        online_cpus = parse_cpulist(value, MAX_CPU_ID);
+    } else {
+        online_cpus = list_indexed_entries(cpu_dir, "cpu");
+    }
+
+    for (int cpu : online_cpus) {
+        bool known = std::any_of(cores.begin(), cores.end(),
+            [cpu](const std::vector<int>& core) { return contains(core, cpu); });
+        if (known) continue;
+
+        std::vector<int> siblings;
+        std::string path = cpu_dir + "/cpu" + std::to_string(cpu) + "/topology/thread_siblings_list";
+        if (read_line(path, value)) {
+            siblings = intersect(parse_cpulist(value, MAX_CPU_ID), online_cpus);
+        }
+        if (!contains(siblings, cpu)) siblings = {cpu};
+        cores.push_back(siblings);
+    }
+
+    std::string node_dir = sysfs_root + "/devices/system/node";
+    for (int id : list_indexed_entries(node_dir, "node")) {
+        if (!read_line(node_dir + "/node" + std::to_string(id) + "/cpulist", value)) continue;
+
+        NumaNode node;
+        node.id = id;
+        node.cpus = intersect(parse_cpulist(value, MAX_CPU_ID), online_cpus);
+        if (!node.cpus.empty()) nodes.push_back(node);
+    }
+    if (nodes.empty()) {
+        nodes.push_back({0, online_cpus});
+    }
+}
+
+// Reserves a quarter of the physical cores (at least one) for the
+// interactive class, taken from the first NUMA node where possible.
+void AffinityPlanner::reserve_default_cores() {
+    reserved_cpus.clear();
+    if (cores.size() < 2) return;
+
+    size_t wanted = std::max<size_t>(1, cores.size() / 4);
+    std::vector<const std::vector<int>*> ordered;
+    for (const auto& core : cores) {
+        if (contains(nodes.front().cpus, core.front())) ordered.push_back(&core);
+    }
+    for (const auto& core : cores) {
+        if (!contains(nodes.front().cpus, core.front())) ordered.push_back(&core);
+    }
+
+    for (size_t i = 0; i < wanted && i < ordered.size(); ++i) {
+        reserved_cpus.insert(reserved_cpus.end(), ordered[i]->begin(), ordered[i]->end());
+    }
+    std::sort(reserved_cpus.begin(), reserved_cpus.end());
+}
+
+void AffinityPlanner::update_shared_cpus() {
+    shared_cpus.clear();
+    std::set_difference(online_cpus.begin(), online_cpus.end(),
+                        reserved_cpus.begin(), reserved_cpus.end(),
+                        std::back_inserter(shared_cpus));
+}
+
+// Throws std::invalid_argument when the list names no online CPU, leaving
+// the current reservation in place.
+void AffinityPlanner::set_reserved_cpus(const std::string& cpulist) {
+    std::vector<int> previous = reserved_cpus;
+
+    if (cpulist.find_first_not_of(" \t\n") == std::string::npos || online_cpus.empty()) {
+        reserve_default_cores();
+    } else {
+        std::vector<int> requested = parse_cpulist(cpulist, online_cpus.back());
+        std::vector<int> reserved;
+        for (const auto& core : cores) {
+            bool wanted = std::any_of(core.begin(), core.end(),
+                [&requested](int cpu) { return contains(requested, cpu); });
+            if (wanted) reserved.insert(reserved.end(), core.begin(), core.end());
+        }
+        if (reserved.empty()) {
+            throw std::invalid_argument("No online CPU in '" + cpulist + "'");
+        }
+        std::sort(reserved.begin(), reserved.end());
+        reserved_cpus = reserved;
+    }
+    if (reserved_cpus == previous) return;
+
+    reset();
+    update_shared_cpus();
+}
+
+std::vector<int> AffinityPlanner::get_reserved_cpus() const {
+    return reserved_cpus;
+}
+
+std::vector<int> AffinityPlanner::get_online_cpus() const {
+    return online_cpus;
+}
+
+bool AffinityPlanner::is_enabled() const {
+    return !reserved_cpus.empty() && !shared_cpus.empty();
+}
+
+std::vector<int> AffinityPlanner::plan_cpus(ProcessClass cls, int preferred_node) const {
+    if (!is_enabled()) return online_cpus;
+
+    switch (cls) {
+        case ProcessClass::INTERACTIVE:
+        case ProcessClass::IO_BOUND:
+            return online_cpus;
+        case ProcessClass::CPU_BOUND:
+        case ProcessClass::BACKGROUND:
+            for (const auto& node : nodes) {
+                if (node.id != preferred_node) continue;
+                std::vector<int> local = intersect(shared_cpus, node.cpus);
+                if (!local.empty()) return local;
+            }
+            return shared_cpus;
+    }
+    return online_cpus;
+}
+
+int AffinityPlanner::get_memory_node(pid_t pid) const {
+    std::ifstream numa_maps("/proc/" + std::to_string(pid) + "/numa_maps");
+    if (!numa_maps.is_open()) return -1;
+
+    std::map<int, long> pages;
+    std::string line;
+    while (std::getline(numa_maps, line)) {
+        std::istringstream iss(line);
+        std::string token;
+        while (iss >> token) {
+            size_t eq = token.find('=');
+            if (token[0] != 'N' || eq == std::string::npos || !std::isdigit(token[1])) continue;
+            pages[std::atoi(token.c_str() + 1)] += std::atol(token.c_str() + eq + 1);
+        }
+    }
+
+    int best_node = -1;
+    long best_pages = 0;
+    for (const auto& pair : pages) {
+        if (pair.second > best_pages) {
+            best_node = pair.first;
+            best_pages = pair.second;
+        }
+    }
+    return best_node;
+}
+
+// Each thread is confined to the intersection of the planned CPUs and its
+// original mask, so confinement never widens a process (e.g. one started
+// with taskset or restricted by its container). Threads whose mask does
+// not overlap the plan are left where they are.
+void AffinityPlanner::apply_affinity(pid_t pid, const std::vector<int>& cpus) {
+    auto& saved = original_masks[pid];
+    if (saved.empty()) {
+        for (pid_t tid : ProcessManager::get_threads(pid)) {
+            std::vector<int> mask = ProcessManager::get_thread_affinity(tid);
+            if (!mask.empty()) saved[tid] = mask;
+        }
+    }
+
+    auto main_thread = saved.find(pid);
+    for (pid_t tid : ProcessManager::get_threads(pid)) {
+        auto it = saved.find(tid);
+        const std::vector<int>& original = it != saved.end() ? it->second
+            : main_thread != saved.end() ? main_thread->second : online_cpus;
+        std::vector<int> mask = intersect(cpus, original);
+        if (mask.empty()) continue;
+
+        try {
+            ProcessManager::set_thread_affinity(tid, mask);
+        } catch (const std::exception& e) {
+            continue;
+        }
+    }
+}
+
+// Threads created after the process was pinned inherited our mask, so they
+// fall back to the main thread's original mask.
+void AffinityPlanner::restore_affinity(pid_t pid) {
+    auto it = original_masks.find(pid);
+    if (it == original_masks.end()) return;
+
+    const auto& saved = it->second;
+    auto main_thread = saved.find(pid);
+    const std::vector<int>& fallback = main_thread != saved.end() ? main_thread->second : online_cpus;
+
+    for (pid_t tid : ProcessManager::get_threads(pid)) {
+        auto mask = saved.find(tid);
+        try {
+            ProcessManager::set_thread_affinity(tid, mask != saved.end() ? mask->second : fallback);
+        } catch (const std::exception& e) {
+            continue;
+        }
+    }
+}
+
+void AffinityPlanner::rebalance(const std::map<pid_t, ProcessClass>& membership) {
+    if (!is_enabled()) return;
+
+    // Processes filtered out of this round (e.g. suspended) stay tracked so
+    // reset() can still restore them; only exited processes are forgotten.
+    for (auto it = applied.begin(); it != applied.end();) {
+        if (!membership.count(it->first) && !ProcessManager::process_exists(it->first)) {
+            original_masks.erase(it->first);
+            it = applied.erase(it);
+        } else {
+            ++it;
+        }
+    }
+
+    // Only the confined classes are moved; a process leaving them gets its
+    // original mask back and is no longer touched.
+    for (const auto& pair : membership) {
+        auto it = applied.find(pair.first);
+        if (!is_confined(pair.second)) {
+            if (it == applied.end()) continue;
+            restore_affinity(pair.first);
+            original_masks.erase(pair.first);
+            applied.erase(it);
+            continue;
+        }
+        if (it != applied.end() && it->second == pair.second) continue;
+
+        int node = nodes.size() > 1 ? get_memory_node(pair.first) : -1;
+        apply_affinity(pair.first, plan_cpus(pair.second, node));
+        applied[pair.first] = pair.second;
+    }
+}
+
+void AffinityPlanner::reset() {
+    for (const auto& pair : applied) {
+        restore_affinity(pair.first);
+    }
+    applied.clear();
+    original_masks.clear();
+}
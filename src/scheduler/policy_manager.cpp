@@ -0,0 +1,188 @@
+#include "policy_manager.h"
+#include <sched.h>
+#include <sys/resource.h>
+#include <cerrno>
+#include <fstream>
+#include <algorithm>
+#include <exception>
+
+namespace {
+
+const char* RR_TIMESLICE_PATH = "/proc/sys/kernel/sched_rr_timeslice_ms";
+
+bool same_policy(const SchedPolicy& a, const SchedPolicy& b) {
+    return a.policy == b.policy && a.rt_priority == b.rt_priority &&
+           a.util_min == b.util_min && a.util_max == b.util_max &&
+           a.slice_us == b.slice_us && a.io_class == b.io_class &&
+           a.io_level == b.io_level;
+}
+
+}
+
+PolicyManager::PolicyManager()
+    : time_slice_ms(5),
+      realtime_interactive(false),
+      saved_rr_timeslice_ms(-1) {}
+
+PolicyManager::~PolicyManager() {
+    reset();
+}
+
+void PolicyManager::set_time_slice(int time_slice_ms) {
+    this->time_slice_ms = std::max(1, time_slice_ms);
+    if (saved_rr_timeslice_ms >= 0) set_rr_timeslice(true);
+}
+
+void PolicyManager::set_realtime_interactive(bool enabled) {
+    realtime_interactive = enabled;
+}
+
+// Foreground status only means "attached to a terminal", so compilers and
+// other CPU-heavy foreground jobs stay on SCHED_OTHER even when real-time
+// interactive scheduling is enabled.
+SchedPolicy PolicyManager::plan_policy(ProcessClass cls, double cpu_usage) const {
+    switch (cls) {
+        case ProcessClass::INTERACTIVE:
+            if (realtime_interactive && cpu_usage <= CPU_BOUND_THRESHOLD) {
+                return {SCHED_RR, 1, 256, 1024, 0, IO_CLASS_BEST_EFFORT, 0};
+            }
+            return {SCHED_OTHER, 0, 256, 1024, 0, IO_CLASS_BEST_EFFORT, 0};
+        case ProcessClass::IO_BOUND:
+            return {SCHED_OTHER, 0, 0, 1024, 0, IO_CLASS_BEST_EFFORT, 2};
+        case ProcessClass::CPU_BOUND:
+            return {SCHED_BATCH, 0, 0, 768, 0, IO_CLASS_BEST_EFFORT, 7};
+        case ProcessClass::BACKGROUND:
+            break;
+    }
+    return {SCHED_IDLE, 0, 0, 512, 0, IO_CLASS_IDLE, 0};
+}
+
+// EEVDF (Linux 6.12+) honours sched_runtime as a per-task slice request for
+// fair tasks; older kernels ignore it.
+SchedPolicy PolicyManager::round_robin_policy() const {
+    return {SCHED_OTHER, 0, 0, 1024, time_slice_ms * 1000L, IO_CLASS_BEST_EFFORT, 4};
+}
+
+void PolicyManager::apply_policy(pid_t pid, const SchedPolicy& policy) {
+    errno = 0;
+    int nice = getpriority(PRIO_PROCESS, pid);
+    if (errno != 0) return;
+
+    bool first_touch = !original_states.count(pid);
+    auto& saved = original_states[pid];
+    auto previous = applied.find(pid);
+    bool we_set_rr = previous != applied.end() && previous->second.policy == SCHED_RR;
+
+    for (pid_t tid : ProcessManager::get_threads(pid)) {
+        TaskSchedState state;
+        if (!ProcessManager::get_task_sched_state(tid, state)) continue;
+
+        auto it = saved.find(tid);
+        if (it == saved.end()) {
+            // Threads spawned after the first touch are only ours to change
+            // if they inherited a real-time policy we set on the process
+            if (ProcessManager::is_realtime_policy(state.policy) &&
+                (first_touch || state.policy != SCHED_RR || !we_set_rr)) {
+                continue;
+            }
+            it = saved.emplace(tid, state).first;
+        }
+        if (ProcessManager::is_realtime_policy(it->second.policy)) continue;
+
+        try {
+            ProcessManager::set_task_sched_policy(tid, policy, nice);
+            ProcessManager::set_task_io_priority(tid, policy.io_class, policy.io_level);
+        } catch (const std::exception& e) {
+            continue;
+        }
+    }
+}
+
+void PolicyManager::restore_policy(pid_t pid) {
+    auto saved = original_states.find(pid);
+    if (saved == original_states.end()) return;
+
+    TaskSchedState fallback = {SCHED_OTHER, 0, 0, 0, 0, 1024, IO_CLASS_NONE, 0};
+    auto main_thread = saved->second.find(pid);
+    if (main_thread != saved->second.end()) fallback = main_thread->second;
+
+    for (pid_t tid : ProcessManager::get_threads(pid)) {
+        auto it = saved->second.find(tid);
+        const TaskSchedState& state = it != saved->second.end() ? it->second : fallback;
+        if (ProcessManager::is_realtime_policy(state.policy)) continue;
+
+        if (it == saved->second.end()) {
+            // Never saved: leave real-time threads alone unless they carry
+            // the RR policy we applied to the process
+            TaskSchedState current;
+            if (!ProcessManager::get_task_sched_state(tid, current)) continue;
+            auto previous = applied.find(pid);
+            if (ProcessManager::is_realtime_policy(current.policy) &&
+                (current.policy != SCHED_RR || previous == applied.end() ||
+                 previous->second.policy != SCHED_RR)) {
+                continue;
+            }
+        }
+
+        try {
+            ProcessManager::restore_task_sched_state(tid, state);
+        } catch (const std::exception& e) {
+            continue;
+        }
+    }
+}
+
+void PolicyManager::set_rr_timeslice(bool enabled) {
+    if (enabled) {
+        if (saved_rr_timeslice_ms < 0) {
+            std::ifstream in(RR_TIMESLICE_PATH);
+            if (!(in >> saved_rr_timeslice_ms)) return;
+        }
+        std::ofstream out(RR_TIMESLICE_PATH);
+        out << time_slice_ms << std::endl;
+    } else if (saved_rr_timeslice_ms >= 0) {
+        std::ofstream out(RR_TIMESLICE_PATH);
+        out << saved_rr_timeslice_ms << std::endl;
+        saved_rr_timeslice_ms = -1;
+    }
+}
+
+void PolicyManager::rebalance(const std::map<pid_t, SchedPolicy>& desired) {
+    for (auto it = applied.begin(); it != applied.end();) {
+        if (desired.count(it->first)) {
+            ++it;
+            continue;
+        }
+        // No longer managed but still running (e.g. suspended): hand it back
+        // its original attributes instead of leaving it demoted
+        if (ProcessManager::process_exists(it->first)) restore_policy(it->first);
+        original_states.erase(it->first);
+        it = applied.erase(it);
+    }
+
+    bool uses_rr = false;
+    for (const auto& pair : desired) {
+        if (pair.second.policy == SCHED_RR) uses_rr = true;
+
+        auto it = applied.find(pair.first);
+        if (it != applied.end() && same_policy(it->second, pair.second)) continue;
+
+        apply_policy(pair.first, pair.second);
+        applied[pair.first] = pair.second;
+    }
+
+    if (uses_rr && saved_rr_timeslice_ms < 0) {
+        set_rr_timeslice(true);
+    } else if (!uses_rr) {
+        set_rr_timeslice(false);
+    }
+}
+
+void PolicyManager::reset() {
+    for (const auto& pair : original_states) {
+        restore_policy(pair.first);
+    }
+    original_states.clear();
+    applied.clear();
+    set_rr_timeslice(false);
+}
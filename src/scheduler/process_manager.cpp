@@ -11,6 +11,79 @@
 #include <stdexcept>
 #include <algorithm>
 #include <unistd.h>
+#include <sched.h>
+#include <sys/syscall.h>
+#include <cstdint>
+
+#ifndef SCHED_FLAG_UTIL_CLAMP_MIN
+#define SCHED_FLAG_UTIL_CLAMP_MIN 0x20
+#define SCHED_FLAG_UTIL_CLAMP_MAX 0x40
+#endif
+
+#define IOPRIO_CLASS_SHIFT 13
+#define IOPRIO_WHO_PROCESS 1
+#define MAX_CPUS 8192
+
+#ifndef SCHED_DEADLINE
+#define SCHED_DEADLINE 6
+#endif
+
+namespace {
+
+// Layout of the kernel's struct sched_attr (SCHED_ATTR_SIZE_VER1).
+struct KernelSchedAttr {
+    uint32_t size;
+    uint32_t sched_policy;
+    uint64_t sched_flags;
+    int32_t sched_nice;
+    uint32_t sched_priority;
+    uint64_t sched_runtime;
+    uint64_t sched_deadline;
+    uint64_t sched_period;
+    uint32_t sched_util_min;
+    uint32_t sched_util_max;
+};
+
+std::vector<pid_t> list_threads(pid_t pid) {
+    std::vector<pid_t> tids;
+    DIR* dir = opendir(("/proc/" + std::to_string(pid) + "/task").c_str());
+    if (dir) {
+        struct dirent* entry;
+        while ((entry = readdir(dir))) {
+            if (std::isdigit(entry->d_name[0])) tids.push_back(std::stoi(entry->d_name));
+        }
+        closedir(dir);
+    }
+    if (tids.empty()) tids.push_back(pid);
+    return tids;
+}
+
+// A utilization clamp of -1 resets that clamp to the system default
+// rather than pinning a user-defined value.
+int write_sched_attr(pid_t tid, KernelSchedAttr& attr) {
+    attr.size = sizeof(attr);
+    attr.sched_flags = SCHED_FLAG_UTIL_CLAMP_MIN | SCHED_FLAG_UTIL_CLAMP_MAX;
+    if (syscall(SYS_sched_setattr, tid, &attr, 0) == 0) return 0;
+    if (errno == EOPNOTSUPP || errno == EINVAL) {
+        // Kernel without CONFIG_UCLAMP_TASK (or without -1 reset support):
+        // apply the policy alone
+        attr.sched_flags = 0;
+        if (syscall(SYS_sched_setattr, tid, &attr, 0) == 0) return 0;
+    }
+    return errno;
+}
+
+void throw_task_error(const char* what, pid_t tid, int error) {
+    if (error == EPERM) {
+        throw std::runtime_error(std::string("Permission denied to set ") + what + " for TID " + 
+            std::to_string(tid) + " (need root privileges)");
+    } else if (error != 0 && error != ESRCH) {
+        throw std::runtime_error(std::string("Failed to set ") + what + " for TID " + 
+            std::to_string(tid) + ": " + strerror(error));
+    }
+}
+
+}
 
 std::vector<ProcessInfo> ProcessManager::get_running_processes() {
     std::vector<ProcessInfo> processes;
@@ -117,8 +190,17 @@ std::vector<ProcessInfo> ProcessManager::get_running_processes() {
                          name.find("systemd") != std::string::npos || 
                          name.find("kthreadd") != std::string::npos;
         
+        errno = 0;
         int current_priority = getpriority(PRIO_PROCESS, pid);
         if (errno == ESRCH) continue; 
+        
+        KernelSchedAttr attr = {};
+        attr.sched_util_max = 1024;
+        syscall(SYS_sched_getattr, pid, &attr, sizeof(attr), 0);
+        if (attr.sched_util_max == 0) attr.sched_util_max = 1024; // kernel without uclamp
+        
+        long ioprio = syscall(SYS_ioprio_get, IOPRIO_WHO_PROCESS, pid);
+        if (ioprio < 0) ioprio = 0;
 
         processes.push_back({
             pid, 
@@ -129,7 +211,12 @@ std::vector<ProcessInfo> ProcessManager::get_running_processes() {
             current_priority, 
             mem, 
             cpu_usage, 
-            cpu_time
+            cpu_time,
+            static_cast<int>(attr.sched_policy),
+            static_cast<int>(attr.sched_util_min),
+            static_cast<int>(attr.sched_util_max),
+            static_cast<int>(ioprio >> IOPRIO_CLASS_SHIFT),
+            static_cast<int>(ioprio & 0xff)
         });
     }
     closedir(dir);
@@ -151,6 +238,121 @@ void ProcessManager::set_priority(pid_t pid, int priority) {
     }
 }
 
+bool ProcessManager::process_exists(pid_t pid) {
+    return kill(pid, 0) == 0 || errno == EPERM;
+}
+
+std::vector<pid_t> ProcessManager::get_threads(pid_t pid) {
+    return list_threads(pid);
+}
+
+std::vector<int> ProcessManager::get_thread_affinity(pid_t tid) {
+    std::vector<int> cpus;
+    cpu_set_t* mask = CPU_ALLOC(MAX_CPUS);
+    size_t mask_size = CPU_ALLOC_SIZE(MAX_CPUS);
+    CPU_ZERO_S(mask_size, mask);
+    
+    if (sched_getaffinity(tid, mask_size, mask) == 0) {
+        for (int cpu = 0; cpu < MAX_CPUS; ++cpu) {
+            if (CPU_ISSET_S(cpu, mask_size, mask)) cpus.push_back(cpu);
+        }
+    }
+    CPU_FREE(mask);
+    return cpus;
+}
+
+void ProcessManager::set_thread_affinity(pid_t tid, const std::vector<int>& cpus) {
+    if (cpus.empty()) return;
+    
+    int max_cpu = *std::max_element(cpus.begin(), cpus.end());
+    cpu_set_t* mask = CPU_ALLOC(max_cpu + 1);
+    size_t mask_size = CPU_ALLOC_SIZE(max_cpu + 1);
+    CPU_ZERO_S(mask_size, mask);
+    for (int cpu : cpus) {
+        CPU_SET_S(cpu, mask_size, mask);
+    }
+    
+    int error = sched_setaffinity(tid, mask_size, mask) != 0 ? errno : 0;
+    CPU_FREE(mask);
+    
+    if (error == EPERM) {
+        throw std::runtime_error("Permission denied to set CPU affinity for TID " + 
+            std::to_string(tid) + " (need root privileges)");
+    } else if (error != 0 && error != ESRCH) {
+        throw std::runtime_error("Failed to set CPU affinity for TID " + 
+            std::to_string(tid) + ": " + strerror(error));
+    }
+}
+
+void ProcessManager::set_affinity(pid_t pid, const std::vector<int>& cpus) {
+    std::string error;
+    for (pid_t tid : list_threads(pid)) {
+        try {
+            set_thread_affinity(tid, cpus);
+        } catch (const std::exception& e) {
+            error = e.what();
+        }
+    }
+    
+    if (!error.empty()) {
+        throw std::runtime_error("Failed to set CPU affinity for PID " + 
+            std::to_string(pid) + ": " + error);
+    }
+}
+
+bool ProcessManager::is_realtime_policy(int policy) {
+    return policy == SCHED_FIFO || policy == SCHED_RR || policy == SCHED_DEADLINE;
+}
+
+bool ProcessManager::get_task_sched_state(pid_t tid, TaskSchedState& state) {
+    KernelSchedAttr attr = {};
+    if (syscall(SYS_sched_getattr, tid, &attr, sizeof(attr), 0) != 0) return false;
+    
+    long ioprio = syscall(SYS_ioprio_get, IOPRIO_WHO_PROCESS, tid);
+    if (ioprio < 0) return false;
+    
+    state.policy = attr.sched_policy;
+    state.nice = attr.sched_nice;
+    state.rt_priority = attr.sched_priority;
+    state.runtime_ns = attr.sched_runtime;
+    state.util_min = attr.sched_util_min;
+    state.util_max = attr.sched_util_max == 0 ? 1024 : attr.sched_util_max;
+    state.io_class = ioprio >> IOPRIO_CLASS_SHIFT;
+    state.io_level = ioprio & 0xff;
+    return true;
+}
+
+void ProcessManager::set_task_sched_policy(pid_t tid, const SchedPolicy& policy, int nice) {
+    KernelSchedAttr attr = {};
+    attr.sched_policy = policy.policy;
+    attr.sched_nice = std::max(-20, std::min(19, nice));
+    attr.sched_priority = (policy.policy == SCHED_RR || policy.policy == SCHED_FIFO) ? policy.rt_priority : 0;
+    attr.sched_runtime = static_cast<uint64_t>(policy.slice_us) * 1000;
+    attr.sched_util_min = static_cast<uint32_t>(policy.util_min);
+    attr.sched_util_max = static_cast<uint32_t>(policy.util_max);
+    throw_task_error("scheduling policy", tid, write_sched_attr(tid, attr));
+}
+
+void ProcessManager::set_task_io_priority(pid_t tid, int io_class, int io_level) {
+    long ioprio = (static_cast<long>(io_class) << IOPRIO_CLASS_SHIFT) | std::max(0, std::min(7, io_level));
+    int error = syscall(SYS_ioprio_set, IOPRIO_WHO_PROCESS, tid, ioprio) != 0 ? errno : 0;
+    throw_task_error("I/O priority", tid, error);
+}
+
+void ProcessManager::restore_task_sched_state(pid_t tid, const TaskSchedState& state) {
+    KernelSchedAttr attr = {};
+    attr.sched_policy = state.policy;
+    attr.sched_nice = state.nice;
+    attr.sched_priority = state.rt_priority;
+    attr.sched_runtime = state.runtime_ns;
+    bool default_clamps = state.util_min == 0 && state.util_max == 1024;
+    attr.sched_util_min = default_clamps ? static_cast<uint32_t>(-1) : state.util_min;
+    attr.sched_util_max = default_clamps ? static_cast<uint32_t>(-1) : state.util_max;
+    throw_task_error("scheduling policy", tid, write_sched_attr(tid, attr));
+    
+    set_task_io_priority(tid, state.io_class, state.io_level);
+}
+
 void ProcessManager::suspend_process(pid_t pid) {
     if (kill(pid, 0) != 0) {
         if (errno == ESRCH) {
@@ -2,26 +2,56 @@
 #include "process_manager.h"
 #include "memory_manager.h"
 #include "logger.h"
+#include "power_manager.h"
+#include "affinity_planner.h"
+#include "policy_manager.h"
 #include <iostream>
 #include <algorithm>
 #include <chrono>
 #include <thread>
 #include <numeric>
 
-Scheduler::Scheduler() 
+namespace {
+
+const char* mode_name(Mode mode) {
+    switch (mode) {
+        case Mode::GAMING:
+            return "Gaming";
+        case Mode::POWER_SAVING:
+            return "Power-Saving";
+        case Mode::PRODUCTIVITY:
+            break;
+    }
+    return "Productivity";
+}
+
+}
+
+Scheduler::Scheduler(const std::string& sysfs_root) 
     : current_mode(Mode::PRODUCTIVITY), 
       current_algorithm(SchedulingAlgorithm::HYBRID), 
+      power_manager(new PowerManager(sysfs_root)),
+      affinity_planner(new AffinityPlanner(sysfs_root)),
+      policy_manager(new PolicyManager()),
       running(false), 
       time_slice_ms(5), 
       mem_threshold_mb(200) {}
 
 Scheduler::~Scheduler() {
     stop_monitoring();
+    restore_power_settings();
+    restore_affinity();
+    restore_policies();
 }
 
 void Scheduler::set_mode(Mode mode) {
     std::unique_lock<std::shared_mutex> lock(rw_mtx);
+    if (power_manager->has_rapl()) {
+        // Charge the energy used since the last tick to the outgoing mode
+        Logger::log_power(mode_name(current_mode), power_manager->sample_power());
+    }
     current_mode = mode;
+    power_manager->apply_mode(mode);
     apply_mode_settings();
     cv.notify_all();
 }
@@ -35,6 +65,7 @@ void Scheduler::set_custom_params(int time_slice_ms, double mem_threshold_mb) {
     std::unique_lock<std::shared_mutex> lock(rw_mtx);
     this->time_slice_ms = std::max(1, time_slice_ms);
     this->mem_threshold_mb = std::max(50.0, mem_threshold_mb);
+    policy_manager->set_time_slice(this->time_slice_ms);
 }
 
 void Scheduler::start_monitoring() {
@@ -61,10 +92,15 @@ void Scheduler::monitoring_loop() {
                 std::unique_lock<std::shared_mutex> lock(rw_mtx);
                 monitor_processes();
                 perform_scheduling();
+                apply_affinity();
+                apply_policies();
                 MemoryManager::optimize_memory(processes, mem_threshold_mb);
                 Logger::log_performance(processes, 
                     MemoryManager::get_system_memory_usage(), 
                     MemoryManager::get_cpu_usage());
+                if (power_manager->has_rapl()) {
+                    Logger::log_power(mode_name(current_mode), power_manager->sample_power());
+                }
             }
             
             std::this_thread::sleep_for(std::chrono::seconds(1));
@@ -231,6 +267,17 @@ void Scheduler::rr_schedule() {
     }
 }
 
+ProcessClass Scheduler::classify_process(const ProcessInfo& proc) {
+    if (proc.is_foreground) {
+        return ProcessClass::INTERACTIVE;
+    } else if (proc.cpu_usage > CPU_BOUND_THRESHOLD) {
+        return ProcessClass::CPU_BOUND;
+    } else if (proc.cpu_usage < 20.0) {
+        return ProcessClass::IO_BOUND;
+    }
+    return ProcessClass::BACKGROUND;
+}
+
 void Scheduler::hybrid_schedule() {
     if (processes.empty()) return;
     
@@ -239,14 +286,19 @@ void Scheduler::hybrid_schedule() {
     for (auto& proc : processes) {
         if (proc.is_suspended || proc.is_system) continue;
         
-        if (proc.is_foreground) {
-            interactive.push_back(&proc);
-        } else if (proc.cpu_usage > 70.0) {
-            cpu_bound.push_back(&proc);
-        } else if (proc.cpu_usage < 20.0) {
-            io_bound.push_back(&proc);
-        } else {
-            background.push_back(&proc);
+        switch (classify_process(proc)) {
+            case ProcessClass::INTERACTIVE:
+                interactive.push_back(&proc);
+                break;
+            case ProcessClass::CPU_BOUND:
+                cpu_bound.push_back(&proc);
+                break;
+            case ProcessClass::IO_BOUND:
+                io_bound.push_back(&proc);
+                break;
+            case ProcessClass::BACKGROUND:
+                background.push_back(&proc);
+                break;
         }
     }   
 
@@ -295,6 +347,37 @@ void Scheduler::hybrid_schedule() {
     }
 }
 
+void Scheduler::apply_affinity() {
+    if (current_mode != Mode::GAMING && current_algorithm != SchedulingAlgorithm::HYBRID) {
+        affinity_planner->reset();
+        return;
+    }
+    
+    std::map<pid_t, ProcessClass> membership;
+    for (const auto& proc : processes) {
+        if (proc.is_suspended || proc.is_system) continue;
+        membership[proc.pid] = classify_process(proc);
+    }
+    affinity_planner->rebalance(membership);
+}
+
+void Scheduler::apply_policies() {
+    if (current_algorithm != SchedulingAlgorithm::HYBRID &&
+        current_algorithm != SchedulingAlgorithm::RR) {
+        policy_manager->reset();
+        return;
+    }
+    
+    std::map<pid_t, SchedPolicy> desired;
+    for (const auto& proc : processes) {
+        if (proc.is_suspended || proc.is_system) continue;
+        desired[proc.pid] = current_algorithm == SchedulingAlgorithm::HYBRID
+            ? policy_manager->plan_policy(classify_process(proc), proc.cpu_usage)
+            : policy_manager->round_robin_policy();
+    }
+    policy_manager->rebalance(desired);
+}
+
 void Scheduler::adjust_priorities() {
     std::unique_lock<std::shared_mutex> lock(rw_mtx);
     apply_mode_settings();
@@ -303,4 +386,44 @@ void Scheduler::adjust_priorities() {
 std::vector<ProcessInfo> Scheduler::get_processes() const {
     std::shared_lock<std::shared_mutex> lock(rw_mtx);
     return processes;
+}
+
+double Scheduler::get_power_watts() const {
+    std::shared_lock<std::shared_mutex> lock(rw_mtx);
+    return power_manager->get_current_power();
+}
+
+std::map<Mode, double> Scheduler::get_mode_power() const {
+    std::shared_lock<std::shared_mutex> lock(rw_mtx);
+    return power_manager->get_mode_power();
+}
+
+void Scheduler::restore_power_settings() {
+    std::unique_lock<std::shared_mutex> lock(rw_mtx);
+    power_manager->restore();
+}
+
+void Scheduler::set_reserved_cpus(const std::string& cpulist) {
+    std::unique_lock<std::shared_mutex> lock(rw_mtx);
+    affinity_planner->set_reserved_cpus(cpulist);
+}
+
+std::vector<int> Scheduler::get_reserved_cpus() const {
+    std::shared_lock<std::shared_mutex> lock(rw_mtx);
+    return affinity_planner->get_reserved_cpus();
+}
+
+void Scheduler::restore_affinity() {
+    std::unique_lock<std::shared_mutex> lock(rw_mtx);
+    affinity_planner->reset();
+}
+
+void Scheduler::set_realtime_interactive(bool enabled) {
+    std::unique_lock<std::shared_mutex> lock(rw_mtx);
+    policy_manager->set_realtime_interactive(enabled);
+}
+
+void Scheduler::restore_policies() {
+    std::unique_lock<std::shared_mutex> lock(rw_mtx);
+    policy_manager->reset();
 }
\ No newline at end of file
@@ -3,6 +3,7 @@
 #include "scheduler.h"
 #include "process_manager.h"
 #include "memory_manager.h"
+#include <sched.h>
 
 namespace py = pybind11;
 
@@ -20,6 +21,11 @@ PYBIND11_MODULE(scheduler_module, m) {
         .def_readonly("memory_usage", &ProcessInfo::memory_usage, "Memory usage in bytes")
         .def_readonly("cpu_usage", &ProcessInfo::cpu_usage, "CPU usage percentage")
         .def_readonly("last_cpu_time", &ProcessInfo::last_cpu_time, "Last CPU time in jiffies")
+        .def_readonly("sched_policy", &ProcessInfo::sched_policy, "Scheduling policy (SCHED_OTHER, SCHED_BATCH, ...)")
+        .def_readonly("util_min", &ProcessInfo::util_min, "Minimum utilization clamp (0-1024)")
+        .def_readonly("util_max", &ProcessInfo::util_max, "Maximum utilization clamp (0-1024)")
+        .def_readonly("io_class", &ProcessInfo::io_class, "I/O priority class (IO_CLASS_NONE, IO_CLASS_BEST_EFFORT, ...)")
+        .def_readonly("io_level", &ProcessInfo::io_level, "I/O priority level within the class (0-7)")
         .def("__repr__", [](const ProcessInfo& p) {
             return "<ProcessInfo pid=" + std::to_string(p.pid) + 
                    " name='" + p.name + "' priority=" + std::to_string(p.priority) + ">";
@@ -40,7 +46,9 @@ PYBIND11_MODULE(scheduler_module, m) {
         .export_values();
     
     py::class_<Scheduler>(m, "Scheduler")
-        .def(py::init<>(), "Create a new scheduler instance")
+        .def(py::init<const std::string&>(),
+             py::arg("sysfs_root") = "/sys",
+             "Create a new scheduler instance")
         .def("set_mode", &Scheduler::set_mode, 
              py::arg("mode"),
              "Set the scheduler mode (Gaming/Productivity/Power-Saving)")
@@ -57,7 +65,26 @@ PYBIND11_MODULE(scheduler_module, m) {
              py::arg("time_slice_ms"), py::arg("mem_threshold_mb"),
              "Set custom scheduling parameters")
         .def("adjust_priorities", &Scheduler::adjust_priorities,
-             "Manually adjust process priorities based on current mode");
+             "Manually adjust process priorities based on current mode")
+        .def("get_power_watts", &Scheduler::get_power_watts,
+             "Get the latest RAPL package power in watts (0 if unavailable)")
+        .def("get_mode_power", &Scheduler::get_mode_power,
+             "Get average package power in watts for each mode sampled so far")
+        .def("restore_power_settings", &Scheduler::restore_power_settings,
+             "Restore the original cpufreq governor, EPP and max frequency")
+        .def("set_reserved_cpus", &Scheduler::set_reserved_cpus,
+             py::arg("cpulist"),
+             "Reserve CPUs (cpulist such as '0-3,8') for interactive processes; empty for automatic. "
+             "Raises ValueError if the list names no online CPU")
+        .def("get_reserved_cpus", &Scheduler::get_reserved_cpus,
+             "Get the CPUs reserved for interactive processes")
+        .def("restore_affinity", &Scheduler::restore_affinity,
+             "Restore the original CPU mask of every thread the planner confined")
+        .def("set_realtime_interactive", &Scheduler::set_realtime_interactive,
+             py::arg("enabled"),
+             "Run interactive processes that are not CPU-bound under SCHED_RR with the configured time slice (Hybrid only)")
+        .def("restore_policies", &Scheduler::restore_policies,
+             "Restore the original scheduling policy, clamps and I/O priority of every managed thread");
     
     py::class_<ProcessManager>(m, "ProcessManager")
         .def_static("get_running_processes", &ProcessManager::get_running_processes,
@@ -65,6 +92,9 @@ PYBIND11_MODULE(scheduler_module, m) {
         .def_static("set_priority", &ProcessManager::set_priority,
                     py::arg("pid"), py::arg("priority"),
                     "Set process priority (-20 to 19, requires root)")
+        .def_static("set_affinity", &ProcessManager::set_affinity,
+                    py::arg("pid"), py::arg("cpus"),
+                    "Restrict all threads of a process to the given CPUs (requires root)")
         .def_static("suspend_process", &ProcessManager::suspend_process,
                     py::arg("pid"),
                     "Suspend a process with SIGSTOP (requires root)")
@@ -83,6 +113,16 @@ PYBIND11_MODULE(scheduler_module, m) {
         .def_static("get_swap_usage", &MemoryManager::get_swap_usage,
                     "Get current swap usage percentage");
     
+    m.attr("SCHED_OTHER") = SCHED_OTHER;
+    m.attr("SCHED_FIFO") = SCHED_FIFO;
+    m.attr("SCHED_RR") = SCHED_RR;
+    m.attr("SCHED_BATCH") = SCHED_BATCH;
+    m.attr("SCHED_IDLE") = SCHED_IDLE;
+    m.attr("IO_CLASS_NONE") = static_cast<int>(IO_CLASS_NONE);
+    m.attr("IO_CLASS_REALTIME") = static_cast<int>(IO_CLASS_REALTIME);
+    m.attr("IO_CLASS_BEST_EFFORT") = static_cast<int>(IO_CLASS_BEST_EFFORT);
+    m.attr("IO_CLASS_IDLE") = static_cast<int>(IO_CLASS_IDLE);
+    
     m.attr("__version__") = "1.0.0";
     m.attr("__author__") = "Smart Resource Scheduler Team";
 }
\ No newline at end of file
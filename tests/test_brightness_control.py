@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'gui'))
+
+from brightness_control import BrightnessControl
+
+
+class BrightnessControlTest(unittest.TestCase):
+    def setUp(self):
+        self.sysfs = tempfile.TemporaryDirectory(prefix='scheduler_sysfs_')
+        self.device = os.path.join(self.sysfs.name, 'class', 'backlight', 'intel_backlight')
+        os.makedirs(self.device)
+        self._write('max_brightness', '1000')
+        self._write('brightness', '400')
+        self.control = BrightnessControl(self.sysfs.name)
+
+    def tearDown(self):
+        self.control.close()
+        self.sysfs.cleanup()
+
+    def _write(self, name, value):
+        with open(os.path.join(self.device, name), 'w') as f:
+            f.write(value + '\n')
+
+    def _read(self, name):
+        with open(os.path.join(self.device, name)) as f:
+            return f.readline().strip()
+
+    def test_reads_fake_backlight(self):
+        self.assertEqual(self.control.brightness_interface, self.device)
+        self.assertEqual(self.control.get_max_brightness(), 1000)
+        self.assertEqual(self.control.get_current_brightness(), 400)
+        self.assertEqual(self.control.get_brightness_percent(), 40)
+
+    def test_writes_and_restores_brightness(self):
+        self.control.save_current_brightness()
+        self.assertTrue(self.control.set_brightness_percent(75))
+        self.assertEqual(self._read('brightness'), '750')
+        self.assertTrue(self.control.restore_brightness())
+        self.assertEqual(self._read('brightness'), '400')
+
+
+if __name__ == '__main__':
+    unittest.main()
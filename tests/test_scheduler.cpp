@@ -2,7 +2,18 @@
 #include "process_manager.h"
 #include "memory_manager.h"
 #include "logger.h"
+#include "power_manager.h"
+#include "affinity_planner.h"
+#include "policy_manager.h"
 #include <iostream>
+#include <fstream>
+#include <stdexcept>
+#include <cerrno>
+#include <dirent.h>
+#include <sys/stat.h>
+#include <sys/wait.h>
+#include <signal.h>
+#include <sched.h>
 #include <thread>
 #include <chrono>
 #include <iomanip>
@@ -157,6 +168,327 @@ void test_logger() {
     std::cout << "Log entry written. Check 'test_scheduler.log'" << std::endl;
 }
 
+void make_dirs(const std::string& dir) {
+    size_t pos = 0;
+    do {
+        pos = dir.find('/', pos + 1);
+        std::string prefix = dir.substr(0, pos);
+        if (mkdir(prefix.c_str(), 0755) != 0 && errno != EEXIST) {
+            throw std::runtime_error("Failed to create " + prefix);
+        }
+    } while (pos != std::string::npos);
+}
+
+void remove_tree(const std::string& path) {
+    DIR* dir = opendir(path.c_str());
+    if (!dir) {
+        unlink(path.c_str());
+        return;
+    }
+    struct dirent* entry;
+    while ((entry = readdir(dir))) {
+        std::string name = entry->d_name;
+        if (name != "." && name != "..") remove_tree(path + "/" + name);
+    }
+    closedir(dir);
+    rmdir(path.c_str());
+}
+
+// Temporary sysfs root, removed even when a check throws
+struct FakeSysfs {
+    std::string root;
+    
+    FakeSysfs() {
+        char root_template[] = "/tmp/scheduler_sysfs_XXXXXX";
+        if (!mkdtemp(root_template)) {
+            throw std::runtime_error("Failed to create temporary sysfs root");
+        }
+        root = root_template;
+    }
+    
+    ~FakeSysfs() {
+        remove_tree(root);
+    }
+};
+
+void write_sysfs_file(const std::string& path, const std::string& value) {
+    make_dirs(path.substr(0, path.rfind('/')));
+    std::ofstream file(path);
+    file << value << "\n";
+}
+
+std::string read_sysfs_file(const std::string& path) {
+    std::ifstream file(path);
+    std::string value;
+    std::getline(file, value);
+    return value;
+}
+
+void expect_sysfs(const std::string& path, const std::string& expected) {
+    std::string actual = read_sysfs_file(path);
+    if (actual != expected) {
+        throw std::runtime_error(path + ": expected '" + expected + "', got '" + actual + "'");
+    }
+}
+
+void test_power_manager() {
+    print_separator();
+    std::cout << "Testing Power Manager (fake sysfs)" << std::endl;
+    print_separator();
+    
+    FakeSysfs sysfs;
+    const std::string& root = sysfs.root;
+    std::string cpufreq = root + "/devices/system/cpu/cpu0/cpufreq";
+    std::string rapl = root + "/class/powercap/intel-rapl:0";
+    std::string psys = root + "/class/powercap/intel-rapl:1";
+    
+    write_sysfs_file(cpufreq + "/scaling_governor", "schedutil");
+    write_sysfs_file(cpufreq + "/scaling_available_governors", "performance schedutil powersave");
+    write_sysfs_file(cpufreq + "/energy_performance_preference", "balance_performance");
+    write_sysfs_file(cpufreq + "/scaling_max_freq", "3000000");
+    write_sysfs_file(cpufreq + "/cpuinfo_min_freq", "1000000");
+    write_sysfs_file(cpufreq + "/cpuinfo_max_freq", "4000000");
+    write_sysfs_file(rapl + "/name", "package-0");
+    write_sysfs_file(rapl + "/energy_uj", "1000000");
+    write_sysfs_file(rapl + "/max_energy_range_uj", "262143328850");
+    write_sysfs_file(rapl + ":0/name", "core");
+    write_sysfs_file(rapl + ":0/energy_uj", "500000");
+    write_sysfs_file(psys + "/name", "psys");
+    write_sysfs_file(psys + "/energy_uj", "2000000");
+    write_sysfs_file(psys + "/max_energy_range_uj", "262143328850");
+    
+    {
+        PowerManager power(root);
+        if (!power.has_cpufreq() || !power.has_rapl()) {
+            throw std::runtime_error("Fake cpufreq/RAPL tree not discovered");
+        }
+        
+        power.apply_mode(Mode::POWER_SAVING);
+        expect_sysfs(cpufreq + "/scaling_governor", "powersave");
+        expect_sysfs(cpufreq + "/energy_performance_preference", "power");
+        expect_sysfs(cpufreq + "/scaling_max_freq", "2800000");
+        std::cout << "  POWER_SAVING: powersave governor, EPP=power, max 2.8 GHz" << std::endl;
+        
+        std::this_thread::sleep_for(std::chrono::milliseconds(500));
+        write_sysfs_file(rapl + "/energy_uj", "6000000");
+        write_sysfs_file(psys + "/energy_uj", "9000000");
+        double watts = power.sample_power();
+        if (watts <= 0.0 || watts > 11.0) {
+            throw std::runtime_error("Unexpected RAPL power: " + std::to_string(watts) + " W");
+        }
+        auto mode_power = power.get_mode_power();
+        if (!mode_power.count(Mode::POWER_SAVING)) {
+            throw std::runtime_error("No power recorded for POWER_SAVING");
+        }
+        std::cout << "  RAPL power: " << std::fixed << std::setprecision(2) << watts << " W" << std::endl;
+        
+        power.apply_mode(Mode::GAMING);
+        expect_sysfs(cpufreq + "/scaling_governor", "performance");
+        expect_sysfs(cpufreq + "/scaling_max_freq", "4000000");
+        std::cout << "  GAMING: performance governor, max 4.0 GHz" << std::endl;
+    }
+    
+    expect_sysfs(cpufreq + "/scaling_governor", "schedutil");
+    expect_sysfs(cpufreq + "/energy_performance_preference", "balance_performance");
+    expect_sysfs(cpufreq + "/scaling_max_freq", "3000000");
+    std::cout << "  Original cpufreq settings restored on exit" << std::endl;
+    
+    unlink((rapl + "/max_energy_range_uj").c_str());
+    {
+        PowerManager power(root);
+        std::this_thread::sleep_for(std::chrono::milliseconds(200));
+        write_sysfs_file(rapl + "/energy_uj", "1000");
+        if (power.sample_power() != 0.0 || !power.get_mode_power().empty()) {
+            throw std::runtime_error("Wrapped RAPL counter with unknown range was not skipped");
+        }
+        std::cout << "  Wrapped counter without max_energy_range_uj skipped" << std::endl;
+    }
+}
+
+std::string format_cpus(const std::vector<int>& cpus) {
+    std::string result;
+    for (int cpu : cpus) {
+        if (!result.empty()) result += ",";
+        result += std::to_string(cpu);
+    }
+    return result;
+}
+
+void expect_cpus(const std::string& what, const std::vector<int>& actual, const std::string& expected) {
+    if (format_cpus(actual) != expected) {
+        throw std::runtime_error(what + ": expected {" + expected + "}, got {" + format_cpus(actual) + "}");
+    }
+    std::cout << "  " << what << ": {" << expected << "}" << std::endl;
+}
+
+void test_affinity_planner() {
+    print_separator();
+    std::cout << "Testing Affinity Planner (fake sysfs)" << std::endl;
+    print_separator();
+    
+    FakeSysfs sysfs;
+    const std::string& root = sysfs.root;
+    std::string cpu_dir = root + "/devices/system/cpu";
+    std::string node_dir = root + "/devices/system/node";
+    
+    // 2 NUMA nodes, 4 physical cores, 2 SMT threads per core
+    write_sysfs_file(cpu_dir + "/online", "0-7");
+    for (int cpu = 0; cpu < 8; ++cpu) {
+        int core = cpu % 4;
+        write_sysfs_file(cpu_dir + "/cpu" + std::to_string(cpu) + "/topology/thread_siblings_list",
+                         std::to_string(core) + "," + std::to_string(core + 4));
+    }
+    write_sysfs_file(node_dir + "/node0/cpulist", "0-1,4-5");
+    write_sysfs_file(node_dir + "/node1/cpulist", "2-3,6-7");
+    
+    AffinityPlanner planner(root);
+    if (!planner.is_enabled()) {
+        throw std::runtime_error("Affinity planner disabled on fake topology");
+    }
+    
+    expect_cpus("Online CPUs", planner.get_online_cpus(), "0,1,2,3,4,5,6,7");
+    expect_cpus("Default reserved CPUs", planner.get_reserved_cpus(), "0,4");
+    expect_cpus("Interactive", planner.plan_cpus(ProcessClass::INTERACTIVE, -1), "0,1,2,3,4,5,6,7");
+    expect_cpus("I/O bound", planner.plan_cpus(ProcessClass::IO_BOUND, -1), "0,1,2,3,4,5,6,7");
+    expect_cpus("CPU bound", planner.plan_cpus(ProcessClass::CPU_BOUND, -1), "1,2,3,5,6,7");
+    expect_cpus("CPU bound on node 1", planner.plan_cpus(ProcessClass::CPU_BOUND, 1), "2,3,6,7");
+    expect_cpus("Background on node 0", planner.plan_cpus(ProcessClass::BACKGROUND, 0), "1,5");
+
+    // A process started with "taskset -c 0" must never be widened
+    pid_t child = fork();
+    if (child == 0) {
+        pause();
+        _exit(0);
+    }
+    std::vector<int> confined, released;
+    try {
+        ProcessManager::set_thread_affinity(child, {0});
+        planner.rebalance({{child, ProcessClass::CPU_BOUND}});
+        confined = ProcessManager::get_thread_affinity(child);
+        planner.rebalance({{child, ProcessClass::IO_BOUND}});
+        released = ProcessManager::get_thread_affinity(child);
+    } catch (const std::exception& e) {
+        kill(child, SIGKILL);
+        waitpid(child, nullptr, 0);
+        throw;
+    }
+    kill(child, SIGKILL);
+    waitpid(child, nullptr, 0);
+    expect_cpus("CPU bound, pinned to reserved CPU 0", confined, "0");
+    expect_cpus("Pinned process after leaving CPU bound", released, "0");
+
+    planner.set_reserved_cpus("2-3");
+    expect_cpus("Reserved CPUs '2-3'", planner.get_reserved_cpus(), "2,3,6,7");
+    expect_cpus("CPU bound, node 1 fully reserved", planner.plan_cpus(ProcessClass::CPU_BOUND, 1), "0,1,4,5");
+    
+    planner.set_reserved_cpus("6-2000000000");
+    expect_cpus("Reserved CPUs '6-2000000000'", planner.get_reserved_cpus(), "2,3,6,7");
+    
+    bool rejected = false;
+    try {
+        planner.set_reserved_cpus("100");
+    } catch (const std::invalid_argument& e) {
+        rejected = true;
+    }
+    if (!rejected) {
+        throw std::runtime_error("Reserved CPU list with no online CPU was accepted");
+    }
+    expect_cpus("Reserved CPUs after rejecting '100'", planner.get_reserved_cpus(), "2,3,6,7");
+    
+    planner.set_reserved_cpus("0-7");
+    if (planner.is_enabled()) {
+        throw std::runtime_error("Reserving every CPU should disable partitioning");
+    }
+    expect_cpus("Interactive with no shared CPUs", planner.plan_cpus(ProcessClass::INTERACTIVE, -1),
+                "0,1,2,3,4,5,6,7");
+}
+
+void test_policy_manager() {
+    print_separator();
+    std::cout << "Testing Policy Manager" << std::endl;
+    print_separator();
+    
+    PolicyManager policies;
+    SchedPolicy cpu_bound = policies.plan_policy(ProcessClass::CPU_BOUND, 0.0);
+    SchedPolicy background = policies.plan_policy(ProcessClass::BACKGROUND, 0.0);
+    SchedPolicy io_bound = policies.plan_policy(ProcessClass::IO_BOUND, 0.0);
+    if (cpu_bound.policy != SCHED_BATCH || background.policy != SCHED_IDLE ||
+        background.io_class != IO_CLASS_IDLE || io_bound.io_class != IO_CLASS_BEST_EFFORT ||
+        io_bound.io_level >= cpu_bound.io_level) {
+        throw std::runtime_error("Unexpected class policy mapping");
+    }
+    if (policies.plan_policy(ProcessClass::INTERACTIVE, 0.0).policy != SCHED_OTHER) {
+        throw std::runtime_error("Interactive processes must stay SCHED_OTHER by default");
+    }
+    policies.set_realtime_interactive(true);
+    if (policies.plan_policy(ProcessClass::INTERACTIVE, 0.0).policy != SCHED_RR) {
+        throw std::runtime_error("Real-time interactive should map to SCHED_RR");
+    }
+    if (policies.plan_policy(ProcessClass::INTERACTIVE, 95.0).policy != SCHED_OTHER) {
+        throw std::runtime_error("CPU-heavy foreground processes must not be made real-time");
+    }
+    policies.set_time_slice(20);
+    if (policies.round_robin_policy().slice_us != 20000) {
+        throw std::runtime_error("Round-robin policy ignores the configured time slice");
+    }
+    std::cout << "  Class mapping: cpu-bound=BATCH, background=IDLE/idle-io, rr slice=20ms" << std::endl;
+    
+    pid_t child = fork();
+    if (child == 0) {
+        pause();
+        _exit(0);
+    }
+    
+    ProcessManager::set_priority(child, 10);
+    policies.rebalance({{child, cpu_bound}});
+    
+    bool found = false;
+    for (const auto& proc : ProcessManager::get_running_processes()) {
+        if (proc.pid != child) continue;
+        found = true;
+        if (proc.sched_policy != SCHED_BATCH || proc.priority != 10 ||
+            proc.io_class != IO_CLASS_BEST_EFFORT || proc.io_level != 7) {
+            kill(child, SIGKILL);
+            waitpid(child, nullptr, 0);
+            throw std::runtime_error("Applied policy not reported in ProcessInfo");
+        }
+    }
+    policies.reset();
+    kill(child, SIGKILL);
+    waitpid(child, nullptr, 0);
+    if (!found) {
+        throw std::runtime_error("Child process " + std::to_string(child) + " not listed");
+    }
+    std::cout << "  PID " << child << ": SCHED_BATCH, nice 10, I/O be/7 applied and reported" << std::endl;
+
+    child = fork();
+    if (child == 0) {
+        pause();
+        _exit(0);
+    }
+
+    policies.rebalance({{child, cpu_bound}});
+    int applied_policy = sched_getscheduler(child);
+    policies.rebalance({});
+    int released_policy = sched_getscheduler(child);
+    policies.rebalance({{child, cpu_bound}});
+    policies.reset();
+    int reset_policy = sched_getscheduler(child);
+    kill(child, SIGKILL);
+    waitpid(child, nullptr, 0);
+
+    if (applied_policy != SCHED_BATCH) {
+        throw std::runtime_error("Rebalance did not apply the CPU-bound policy");
+    }
+    if (released_policy != SCHED_OTHER) {
+        throw std::runtime_error("Process dropped from rebalance kept its managed policy");
+    }
+    if (reset_policy != SCHED_OTHER) {
+        throw std::runtime_error("Reset did not restore the original policy");
+    }
+    std::cout << "  PID " << child << ": original policy restored on release and on reset" << std::endl;
+}
+
 int main() {
     if (geteuid() != 0) {
         std::cerr << "\nWARNING: Not running as root!" << std::endl;
@@ -178,6 +510,12 @@ int main() {
         test_logger();
         std::this_thread::sleep_for(std::chrono::seconds(1));
         
+        test_power_manager();
+        
+        test_affinity_planner();
+        
+        test_policy_manager();
+        
         if (geteuid() == 0) {
             test_scheduler();
         } else {